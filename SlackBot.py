@@ -1,12 +1,17 @@
 import time
 import os
 import logging
-import json
+import orjson
+import re
+from string import Template
 import requests
 import base64
 import gspread
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any, Set
+import queue
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, List, Dict, Any, Set, Tuple, Callable
 from google.oauth2.service_account import Credentials
 from slack_bolt import App
 from slack_bolt.adapter.flask import SlackRequestHandler
@@ -14,8 +19,10 @@ from flask import Flask, request
 from dotenv import load_dotenv
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from functools import wraps
-from threading import Thread
+from functools import wraps, cached_property
+from threading import Thread, Lock, RLock, Event, Semaphore
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logging.basicConfig(
@@ -29,27 +36,240 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class RateLimiter:
-    """Custom rate limiter implementation"""
+    """Thread-safe token bucket rate limiter"""
     def __init__(self, calls_per_minute):
         self.calls_per_minute = calls_per_minute
-        self.calls = []
+        self.capacity = float(calls_per_minute)
+        self.refill_rate = calls_per_minute / 60  # tokens per second
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = Lock()
+
+    def acquire(self) -> None:
+        """Take one token, sleeping until it is available"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+            self.last_refill = now
+            # Reserve the token now and sleep off any deficit outside the lock
+            self.tokens -= 1
+            sleep_time = -self.tokens / self.refill_rate if self.tokens < 0 else 0
+            sleep_time = max(sleep_time, self.blocked_until - now)
+        if sleep_time > 0:
+            time.sleep(sleep_time)
+
+    def pause(self, seconds: float) -> None:
+        """Block all callers for the given number of seconds"""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def observe(self, response: requests.Response) -> None:
+        """Throttle based on the server's 429 responses and rate-limit headers"""
+        headers = response.headers
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if response.status_code == 429:
+            pause_time = retry_after if retry_after is not None else 60
+            logger.warning(f"Rate limited by {response.url}, pausing for {pause_time:.0f}s")
+            self.pause(pause_time)
+            return
+
+        remaining = headers.get("X-RateLimit-Remaining") or headers.get("X-Rate-Limit-Remaining")
+        limit = headers.get("X-RateLimit-Limit") or headers.get("X-Rate-Limit")
+        try:
+            remaining = int(remaining)
+            limit = int(limit) if limit else self.capacity
+        except (TypeError, ValueError):
+            return
+
+        if remaining < 0.1 * limit:
+            # Don't spend more tokens than the server has left for us
+            with self.lock:
+                self.tokens = min(self.tokens, remaining)
+            if remaining <= 0:
+                self.pause(retry_after if retry_after is not None else 60)
         
     def __call__(self, func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            now = time.time()
-            self.calls = [call_time for call_time in self.calls if now - call_time < 60]
-            
-            if len(self.calls) >= self.calls_per_minute:
-                sleep_time = 60 - (now - self.calls[0])
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
-                    
-            result = func(*args, **kwargs)
-            self.calls.append(time.time())
-            return result
+            self.acquire()
+            return func(*args, **kwargs)
         return wrapper
 
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed TTL"""
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def claim(self, key: Any, value: Any = True) -> bool:
+        """Atomically store key if it is absent or expired; return True if this call stored it"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[1] > time.monotonic():
+                return False
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return True
+
+    def invalidate(self, key: Any) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def create_session(headers: Dict[str, str]) -> requests.Session:
+    """Create a keep-alive session with connection pooling and retries"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        # 429s are left to the shared RateLimiter so every caller backs off together.
+        # Return the final response instead of raising so rate-limit headers can be inspected.
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False
+        )
+    )
+    session.mount("https://", adapter)
+    session.headers.update(headers)
+    return session
+
+def rate_limited_request(session: requests.Session, rate_limiter: RateLimiter,
+                         method: str, url: str,
+                         on_latency: Optional[Callable[[float], None]] = None,
+                         **kwargs) -> requests.Response:
+    """Send a request through the rate limiter and feed its response headers back.
+
+    on_latency, if given, receives the time spent in the HTTP call itself,
+    excluding any wait for the rate limiter.
+    """
+    rate_limiter.acquire()
+    start = time.monotonic()
+    try:
+        response = session.request(method, url, **kwargs)
+    finally:
+        if on_latency is not None:
+            on_latency(time.monotonic() - start)
+    rate_limiter.observe(response)
+    return response
+
+# Slack blocks are serialized once here; only the $placeholders are filled in per message
+def _section_block(text: str) -> Dict[str, Any]:
+    return {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+
+_SECTION_BLOCKS_TMPL = Template(orjson.dumps([_section_block("$text")]).decode())
+
+_ALERT_BLOCKS_TMPL = Template(orjson.dumps([
+    _section_block("*Agent Status Alert*\n⚠️ Agent *$agent_name* has been in Transfers Only status for 10 minutes."),
+    {
+        "type": "actions",
+        "elements": [
+            {
+                "type": "button",
+                "text": {
+                    "type": "plain_text",
+                    "text": "✅",
+                    "emoji": True
+                },
+                "style": "primary",
+                "value": "$agent_name",
+                "action_id": "acknowledge_alert"
+            }
+        ]
+    }
+]).decode())
+
+FEEDBACK_MESSAGE = "Was this answer helpful?"
+
+_FEEDBACK_BLOCKS_TMPL = Template(orjson.dumps([
+    _section_block(FEEDBACK_MESSAGE),
+    {
+        "type": "actions",
+        "elements": [
+            {
+                "type": "button",
+                "text": {"type": "plain_text", "text": "👍 Yes"},
+                "style": "primary",
+                "value": "$feedback_value",
+                "action_id": "feedback_yes"
+            },
+            {
+                "type": "button",
+                "text": {"type": "plain_text", "text": "👎 No"},
+                "style": "danger",
+                "value": "$feedback_value",
+                "action_id": "feedback_no"
+            }
+        ]
+    }
+]).decode())
+
+_ESCALATION_BLOCKS_TMPL = Template(orjson.dumps([
+    _section_block("$text"),
+    {
+        "type": "actions",
+        "elements": [
+            {
+                "type": "button",
+                "text": {"type": "plain_text", "text": "✅ Accept Request"},
+                "style": "primary",
+                "value": "$request_value",
+                "action_id": "accept_request"
+            }
+        ]
+    }
+]).decode())
+
+def render_blocks(template: Template, **values: str) -> str:
+    """Fill a pre-serialized blocks template, JSON-escaping each value"""
+    return template.substitute({name: orjson.dumps(value).decode()[1:-1] for name, value in values.items()})
+
 class Config:
     """Configuration management class"""
     def __init__(self):
@@ -76,6 +296,13 @@ class Config:
         self.ZENDESK_EMAIL = os.getenv("ZENDESK_EMAIL")
         self.ZENDESK_API_TOKEN = os.getenv("ZENDESK_API_TOKEN")
 
+        # Client-side request budgets (requests per minute)
+        self.GURU_CALLS_PER_MINUTE = int(os.getenv("GURU_CALLS_PER_MINUTE", 100))
+        self.ZENDESK_CALLS_PER_MINUTE = int(os.getenv("ZENDESK_CALLS_PER_MINUTE", 200))
+        # Average availability-fetch latency (ms) above which monitor concurrency backs off;
+        # set it above your normal round-trip time to Zendesk
+        self.ZENDESK_TARGET_LATENCY_MS = int(os.getenv("ZENDESK_TARGET_LATENCY_MS", 300))
+
 class GuruAPI:
     """Guru API interaction class"""
     def __init__(self, config: Config):
@@ -83,13 +310,26 @@ class GuruAPI:
         self.auth_header = base64.b64encode(
             f"{config.GURU_USER_EMAIL}:{config.GURU_API_TOKEN}".encode()
         ).decode()
+        self._headers = {
+            "Authorization": f"Basic {self.auth_header}",
+            "Content-Type": "application/json"
+        }
+        self.session = create_session(self._headers)
+        self.rate_limiter = RateLimiter(config.GURU_CALLS_PER_MINUTE)
+        # Repeat questions are common; card content changes slowly
+        self.search_cache = TTLCache(maxsize=1000, ttl=900)
+        self.answer_cache = TTLCache(maxsize=1000, ttl=4 * 3600)
         
     def search_cards(self, query: str) -> List[Dict[str, Any]]:
         """Search Guru cards with error handling"""
+        cache_key = query.lower().strip()
+        cached_cards = self.search_cache.get(cache_key)
+        if cached_cards is not None:
+            return cached_cards
         try:
-            response = requests.get(
+            response = rate_limited_request(
+                self.session, self.rate_limiter, "GET",
                 "https://api.getguru.com/api/v1/search/query",
-                headers=self._get_headers(),
                 params={
                     "searchTerms": query,
                     "organizationId": self.config.GURU_ORG_ID,
@@ -99,17 +339,23 @@ class GuruAPI:
                 timeout=10
             )
             response.raise_for_status()
-            return response.json()
+            cards = response.json()
+            self.search_cache.set(cache_key, cards)
+            return cards
         except Exception as e:
             logger.error(f"Guru API error: {e}")
             return []
 
     def get_answer(self, question: str) -> Optional[Dict[str, Any]]:
         """Get AI-generated answer from Guru"""
+        cache_key = question.lower().strip()
+        cached_answer = self.answer_cache.get(cache_key)
+        if cached_answer is not None:
+            return cached_answer
         try:
-            response = requests.post(
+            response = rate_limited_request(
+                self.session, self.rate_limiter, "POST",
                 "https://api.getguru.com/api/v1/answers",
-                headers=self._get_headers(),
                 json={
                     "organizationId": self.config.GURU_ORG_ID,
                     "agentId": self.config.GURU_AGENT_ID,
@@ -118,60 +364,202 @@ class GuruAPI:
                 timeout=10
             )
             response.raise_for_status()
-            return response.json()
+            answer = response.json()
+            self.answer_cache.set(cache_key, answer)
+            return answer
         except Exception as e:
             logger.error(f"Error getting Guru answer: {e}")
             return None
 
+    def cache_clear(self) -> None:
+        """Drop all cached search results and answers"""
+        self.search_cache.clear()
+        self.answer_cache.clear()
+
     def _get_headers(self) -> Dict[str, str]:
         """Get common headers for Guru API requests"""
-        return {
-            "Authorization": f"Basic {self.auth_header}",
-            "Content-Type": "application/json"
-        }
+        return self._headers
 
 class GoogleSheetsLogger:
     """Google Sheets logging class"""
     def __init__(self, config: Config):
         self.config = config
+
+        # Transient Sheets API errors are retried with exponential backoff
+        self.max_retries = 5
+        self.retryable_statuses = {429, 500, 502, 503}
+
+        # Rows are queued and written in batches by a background thread
+        self.flush_interval = 5  # seconds
+        self.batch_size = 500
+        self._pending_rows: queue.Queue = queue.Queue()
+        # A batch whose write failed transiently; it is sent first on the next flush
+        self._failed_batch: List[List[str]] = []
+        self._flush_lock = RLock()
+        self._flush_requested = Event()
+
+        # In-memory indexes so duplicate checks and row lookups skip the sheet download
+        self._index_lock = Lock()
+        self._seen: Set[Tuple[str, str]] = set()
+        self._row_index: Dict[Tuple[str, str], int] = {}
+        self._index_loaded = False
+
+        thread = Thread(target=self._flush_loop)
+        thread.daemon = True
+        thread.start()
+
+    @cached_property
+    def sheet(self) -> gspread.Worksheet:
+        """Authorize and open the worksheet on first use rather than at startup"""
         # Ensure your service_account.json is NOT committed to version control
         creds = Credentials.from_service_account_file(
             "service_account.json",
             scopes=["https://www.googleapis.com/auth/spreadsheets"]
         )
         self.gc = gspread.authorize(creds)
-        self.sheet = self.gc.open_by_key(config.GOOGLE_SHEET_ID).sheet1
+        return self.gc.open_by_key(self.config.GOOGLE_SHEET_ID).sheet1
+
+    def _with_retry(self, func, *args, **kwargs) -> Any:
+        """Call a Sheets API method, retrying transient errors with backoff and jitter"""
+        for attempt in range(self.max_retries):
+            try:
+                return func(*args, **kwargs)
+            except gspread.exceptions.APIError as e:
+                response = getattr(e, "response", None)
+                status = getattr(response, "status_code", None)
+                if status not in self.retryable_statuses or attempt == self.max_retries - 1:
+                    raise
+                delay = parse_retry_after(response.headers.get("Retry-After"))
+                reason = f"returned {status}"
+            except requests.exceptions.RequestException as e:
+                # Connection resets and timeouts are transient too
+                if attempt == self.max_retries - 1:
+                    raise
+                delay = None
+                reason = f"request failed ({e})"
+            if delay is None:
+                delay = min(60, (2 ** attempt) + random.random())
+            logger.warning(f"Google Sheets API {reason}, retrying in {delay:.1f}s")
+            time.sleep(delay)
 
     def log_entry(self, user_id: str, question: str, answer: str,
                   feedback: str = "Pending", manager: str = "Pending") -> None:
-        """Log entries with deduplication"""
+        """Queue an entry for logging, with deduplication"""
         try:
             real_name = get_slack_user_name(user_id)
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
             # Check for duplicates
-            existing_data = self.sheet.get_all_values()[1:]
-            for row in existing_data:
-                if (len(row) >= 3 and row[1] == real_name and 
-                    row[2].strip().lower() == question.strip().lower()):
+            self._ensure_index()
+            key = (real_name.strip(), question.strip().lower())
+            with self._index_lock:
+                if key in self._seen:
                     logger.info(f"Duplicate entry found for {real_name}")
                     return
+                self._seen.add(key)
 
             new_entry = [timestamp, real_name, question, answer, feedback, manager]
-            self.sheet.append_row(new_entry)
-            logger.info(f"Successfully logged entry for {real_name}")
+            self._pending_rows.put(new_entry)
+            if self._pending_rows.qsize() >= self.batch_size:
+                self._flush_requested.set()
+            logger.info(f"Queued log entry for {real_name}")
         except Exception as e:
             logger.error(f"Error logging to Google Sheets: {e}")
 
+    def flush(self) -> None:
+        """Write all queued rows to the sheet in batches of up to batch_size"""
+        with self._flush_lock:
+            while True:
+                batch, self._failed_batch = self._failed_batch, []
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._pending_rows.get_nowait())
+                    except queue.Empty:
+                        break
+                if not batch:
+                    return
+                try:
+                    response = self._with_retry(self.sheet.append_rows, batch, value_input_option="RAW")
+                    self._index_appended_rows(batch, response)
+                    logger.info(f"Successfully logged {len(batch)} entries")
+                except Exception as e:
+                    status = getattr(getattr(e, "response", None), "status_code", None)
+                    if (isinstance(e, gspread.exceptions.APIError) and status is not None
+                            and 400 <= status < 500 and status not in self.retryable_statuses):
+                        # The sheet rejected the rows outright; retrying won't help
+                        logger.error(f"Dropping {len(batch)} entries rejected by Google Sheets ({status}): {e}")
+                        with self._index_lock:
+                            for row in batch:
+                                self._seen.discard((row[1].strip(), row[2].strip().lower()))
+                        return
+                    logger.error(f"Error writing {len(batch)} entries to Google Sheets, will retry: {e}")
+                    self._failed_batch = batch
+                    return
+
+    def _rebuild_index(self) -> None:
+        """Rebuild the duplicate set and row index from a single sheet download"""
+        with self._flush_lock:
+            self.flush()
+            data = self._with_retry(self.sheet.get_all_values)
+            seen = set()
+            row_index = {}
+            for idx, row in enumerate(data[1:], start=2):
+                if len(row) >= 3:
+                    seen.add((row[1].strip(), row[2].strip().lower()))
+                    row_index.setdefault((row[1].strip(), row[2].strip()), idx)
+            with self._index_lock:
+                # Keep keys for entries queued while the sheet was downloading
+                self._seen.update(seen)
+                self._row_index = row_index
+                self._index_loaded = True
+
+    def _ensure_index(self) -> None:
+        """Load the indexes from the sheet on first use"""
+        if not self._index_loaded:
+            with self._flush_lock:
+                if not self._index_loaded:
+                    self._rebuild_index()
+
+    def _index_appended_rows(self, rows: List[List[str]], response: Dict[str, Any]) -> None:
+        """Record row numbers of freshly appended rows from the append response"""
+        updated_range = (response or {}).get("updates", {}).get("updatedRange", "")
+        match = re.search(r"![A-Z]+(\d+)", updated_range)
+        if not match:
+            # The rows will be found by a rebuild on their first lookup
+            return
+        with self._index_lock:
+            first_row = int(match.group(1))
+            for offset, row in enumerate(rows):
+                self._row_index.setdefault((row[1].strip(), row[2].strip()), first_row + offset)
+
+    def _row_matches(self, row_num: int, key: Tuple[str, str]) -> bool:
+        """Check that columns B:C of a row still hold the given user and question"""
+        values = self._with_retry(self.sheet.get, f"B{row_num}:C{row_num}")
+        row = values[0] if values else []
+        return len(row) >= 2 and (row[0].strip(), row[1].strip()) == key
+
+    def _flush_loop(self) -> None:
+        """Flush queued rows every flush_interval seconds or when a batch fills up"""
+        while True:
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            self.flush()
+
     def update_feedback(self, user_id: str, question: str, feedback: str, manager: str) -> None:
         """Update feedback and manager columns"""
         try:
             user_name = get_slack_user_name(user_id)
+            # The row being updated may still be waiting in the queue
+            self.flush()
             row_num = self.find_row_by_question(user_name, question)
             
             if row_num:
-                self.sheet.update_cell(row_num, 5, feedback)
-                self.sheet.update_cell(row_num, 6, manager)
+                # Feedback and manager are adjacent (columns E:F), so write both in one request
+                self._with_retry(
+                    self.sheet.batch_update,
+                    [{"range": f"E{row_num}:F{row_num}", "values": [[feedback, manager]]}],
+                    value_input_option="RAW"
+                )
                 logger.info(f"Updated feedback to {feedback} and manager to {manager} for {user_name}")
             else:
                 logger.warning(f"No matching row found for {user_name} and question: {question}")
@@ -181,13 +569,17 @@ class GoogleSheetsLogger:
     def find_row_by_question(self, user_name: str, question: str) -> Optional[int]:
         """Find the row number for a specific user and question"""
         try:
-            data = self.sheet.get_all_values()
-            for idx, row in enumerate(data[1:], start=2):
-                if (len(row) >= 3 and 
-                    row[1].strip() == user_name.strip() and 
-                    row[2].strip() == question.strip()):
-                    return idx
-            return None
+            self._ensure_index()
+            key = (user_name.strip(), question.strip())
+            with self._index_lock:
+                row_num = self._row_index.get(key)
+            # Rows may have been sorted, inserted or deleted since the index was built,
+            # so confirm the cached row still holds this user and question
+            if row_num is not None and self._row_matches(row_num, key):
+                return row_num
+            self._rebuild_index()
+            with self._index_lock:
+                return self._row_index.get(key)
         except Exception as e:
             logger.error(f"Error finding row: {e}")
             return None
@@ -199,38 +591,92 @@ class ZendeskMonitor:
         self.slack_client = slack_client
         self.check_interval = 60  # seconds
         self.alert_threshold = 600  # seconds (10 minutes)
-        self.agent_status_times: Dict[int, datetime] = {}
+        self.agent_status_times: Dict[int, float] = {}  # time.monotonic() when tracking started
         self.alerted_agents: Set[int] = set()
+        # The agent roster changes rarely, so only refetch it every agents_cache_ttl seconds
+        self.agents_cache_ttl = 600
+        self._agents_cache: Tuple[Optional[List[Dict]], float] = (None, 0.0)
         # Optionally, add agent IDs to exclude by setting the EXCLUDED_AGENTS env variable (comma-separated IDs)
         excluded = os.getenv("EXCLUDED_AGENTS", "")
         self.excluded_agents = set(map(int, excluded.split(","))) if excluded else set()
-
-    def get_zendesk_headers(self) -> Dict:
-        auth_str = f"{self.config.ZENDESK_EMAIL}/token:{self.config.ZENDESK_API_TOKEN}"
+        auth_str = f"{config.ZENDESK_EMAIL}/token:{config.ZENDESK_API_TOKEN}"
         encoded_auth = base64.b64encode(auth_str.encode()).decode()
-        return {
+        self._zendesk_headers = {
             'Authorization': f'Basic {encoded_auth}',
             'Content-Type': 'application/json'
         }
+        self.session = create_session(self._zendesk_headers)
+        self.rate_limiter = RateLimiter(config.ZENDESK_CALLS_PER_MINUTE)
+        # Availability lookups are network-bound, so fetch them in parallel.
+        # Concurrency adapts (AIMD) to Zendesk latency and throttling.
+        self.min_workers = 1
+        self.max_workers = 16
+        self.target_latency = config.ZENDESK_TARGET_LATENCY_MS / 1000  # seconds
+        self.workers = 4
+        self._latencies: deque = deque(maxlen=50)
+        self._throttled = False
+        self._fetch_slots = Semaphore(self.workers)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+
+    def get_zendesk_headers(self) -> Dict:
+        return self._zendesk_headers
 
     def get_agents(self) -> List[Dict]:
+        cached_agents, fetched_at = self._agents_cache
+        if cached_agents is not None and time.monotonic() - fetched_at < self.agents_cache_ttl:
+            return cached_agents
+
         url = f"https://{self.config.ZENDESK_DOMAIN}.zendesk.com/api/v2/users?role=agent"
         try:
-            response = requests.get(url, headers=self.get_zendesk_headers())
+            response = rate_limited_request(self.session, self.rate_limiter, "GET", url, timeout=10)
             response.raise_for_status()
-            return response.json().get('users', [])
+            agents = response.json().get('users', [])
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching agents: {e}")
-            return []
+            # Keep monitoring with the last known roster if there is one
+            return cached_agents or []
+
+        self._agents_cache = (agents, time.monotonic())
+        self.prune_departed_agents(agents)
+        return agents
+
+    def prune_departed_agents(self, agents: List[Dict]) -> None:
+        """Forget tracking state for agents no longer on the roster"""
+        current_ids = {agent['id'] for agent in agents}
+        for agent_id in list(self.agent_status_times):
+            if agent_id not in current_ids:
+                del self.agent_status_times[agent_id]
+        self.alerted_agents &= current_ids
 
     def get_agent_availability(self, agent_id: int) -> Dict:
         url = f"https://{self.config.ZENDESK_DOMAIN}.zendesk.com/api/v2/channels/voice/availabilities/{agent_id}"
-        try:
-            response = requests.get(url, headers=self.get_zendesk_headers())
-            response.raise_for_status()
-            return response.json().get('availability', {})
-        except requests.exceptions.RequestException:
-            return {}
+        with self._fetch_slots:
+            try:
+                response = rate_limited_request(
+                    self.session, self.rate_limiter, "GET", url,
+                    on_latency=self._latencies.append, timeout=10
+                )
+                if response.status_code == 429 or response.status_code >= 500:
+                    self._throttled = True
+                response.raise_for_status()
+                return response.json().get('availability', {})
+            except requests.exceptions.RequestException:
+                return {}
+
+    def adjust_concurrency(self) -> None:
+        """Grow fetch concurrency by one while healthy, halve it under latency or throttling"""
+        avg_latency = sum(self._latencies) / len(self._latencies) if self._latencies else 0
+        if self._throttled or avg_latency > self.target_latency:
+            self.workers = max(self.min_workers, self.workers // 2)
+            # Judge the reduced concurrency on fresh samples only
+            self._latencies.clear()
+        else:
+            self.workers = min(self.max_workers, self.workers + 1)
+        self._throttled = False
+        self._fetch_slots = Semaphore(self.workers)
+        logger.info(f"Availability fetch concurrency set to {self.workers} (avg latency {avg_latency:.3f}s)")
 
     def send_slack_alert(self, agent_name: str, duration: int) -> None:
         """Send alert to a designated channel about an agent's extended status."""
@@ -238,31 +684,7 @@ class ZendeskMonitor:
             message = {
                 "channel": self.config.CS_LEADS_CHANNEL_ID,
                 "text": f"⚠️ Alert: Agent {agent_name} has been in Transfers Only status for 10 minutes.",
-                "blocks": [
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": f"*Agent Status Alert*\n⚠️ Agent *{agent_name}* has been in Transfers Only status for 10 minutes."
-                        }
-                    },
-                    {
-                        "type": "actions",
-                        "elements": [
-                            {
-                                "type": "button",
-                                "text": {
-                                    "type": "plain_text",
-                                    "text": "✅",
-                                    "emoji": True
-                                },
-                                "style": "primary",
-                                "value": f"{agent_name}",
-                                "action_id": "acknowledge_alert"
-                            }
-                        ]
-                    }
-                ]
+                "blocks": render_blocks(_ALERT_BLOCKS_TMPL, agent_name=agent_name)
             }
             
             self.slack_client.chat_postMessage(**message)
@@ -297,57 +719,78 @@ class ZendeskMonitor:
         
         print("\n" + "="*50 + "\n")
 
-    def monitor_agents(self) -> None:
-        logger.info("Starting Zendesk agent status monitoring...")
-    
-        while True:
-            current_time = datetime.now()
-            agents = self.get_agents()
-            transfers_only_agents = []
+    def run_cycle(self) -> None:
+        """Check every monitored agent once and alert on long Transfers Only stretches"""
+        now = time.monotonic()
+        agents = self.get_agents()
+        transfers_only_agents = []
+        
+        if agents:
+            monitored_agents = [agent for agent in agents if agent['id'] not in self.excluded_agents]
+            availabilities = self.executor.map(
+                lambda agent: self.get_agent_availability(agent['id']), monitored_agents
+            )
             
-            if agents:
-                for agent in agents:
-                    agent_id = agent['id']
+            for agent, availability in zip(monitored_agents, availabilities):
+                agent_id = agent['id']
+                agent_name = agent['name']
+                
+                if availability:
+                    agent_state = availability.get('agent_state')
                     
-                    if agent_id in self.excluded_agents:
-                        continue
+                    if agent_state == 'transfers_only':
+                        if agent_id not in self.agent_status_times:
+                            self.agent_status_times[agent_id] = now
+                            self.alerted_agents.discard(agent_id)
+                            logger.info(f"Started tracking {agent_name} in transfers_only status")
                         
-                    agent_name = agent['name']
-                    availability = self.get_agent_availability(agent_id)
-                    
-                    if availability:
-                        agent_state = availability.get('agent_state')
+                        duration = now - self.agent_status_times[agent_id]
+                        transfers_only_agents.append((agent_name, duration))
                         
-                        if agent_state == 'transfers_only':
-                            if agent_id not in self.agent_status_times:
-                                self.agent_status_times[agent_id] = current_time
-                                self.alerted_agents.discard(agent_id)
-                                logger.info(f"Started tracking {agent_name} in transfers_only status")
-                            
-                            duration = (current_time - self.agent_status_times[agent_id]).total_seconds()
-                            transfers_only_agents.append((agent_name, duration))
-                            
-                            if duration >= self.alert_threshold and agent_id not in self.alerted_agents:
-                                self.send_slack_alert(agent_name, int(duration))
-                                self.alerted_agents.add(agent_id)
-                                logger.info(f"Alert sent for {agent_name} - added to alerted agents")
-                        else:
-                            if agent_id in self.agent_status_times:
-                                logger.info(f"{agent_name} no longer in transfers_only status")
-                            self.agent_status_times.pop(agent_id, None)
-                            self.alerted_agents.discard(agent_id)
-                
-                transfers_only_agents.sort(key=lambda x: x[1], reverse=True)
-                self.print_status_summary(transfers_only_agents)
-                logger.info(f"Monitoring cycle completed. Found {len(transfers_only_agents)} agents in transfers_only status")
+                        if duration >= self.alert_threshold and agent_id not in self.alerted_agents:
+                            self.send_slack_alert(agent_name, int(duration))
+                            self.alerted_agents.add(agent_id)
+                            logger.info(f"Alert sent for {agent_name} - added to alerted agents")
+                    else:
+                        if agent_id in self.agent_status_times:
+                            logger.info(f"{agent_name} no longer in transfers_only status")
+                        self.agent_status_times.pop(agent_id, None)
+                        self.alerted_agents.discard(agent_id)
             
-            time.sleep(self.check_interval)
+            transfers_only_agents.sort(key=lambda x: x[1], reverse=True)
+            self.print_status_summary(transfers_only_agents)
+            logger.info(f"Monitoring cycle completed. Found {len(transfers_only_agents)} agents in transfers_only status")
+            self.adjust_concurrency()
+
+    def monitor_agents(self, stop_event: Event) -> None:
+        logger.info("Starting Zendesk agent status monitoring...")
+    
+        while not stop_event.is_set():
+            self.run_cycle()
+            # Park until the next cycle; wakes immediately when stop_monitoring() is called
+            stop_event.wait(self.check_interval)
+
+        logger.info("Zendesk agent status monitoring stopped")
 
     def start_monitoring(self):
         """Start the monitoring loop in a separate thread"""
-        thread = Thread(target=self.monitor_agents)
+        if self._thread is not None and self._thread.is_alive():
+            if not self._stop_event.is_set():
+                logger.info("Zendesk agent status monitoring is already running")
+                return
+            # A stopped loop may still be finishing its cycle; never run two at once
+            self._thread.join()
+
+        # Each run gets its own stop event so a stale loop can't be revived
+        self._stop_event = Event()
+        thread = Thread(target=self.monitor_agents, args=(self._stop_event,))
         thread.daemon = True
         thread.start()
+        self._thread = thread
+
+    def stop_monitoring(self) -> None:
+        """Ask the monitoring loop to exit after its current cycle"""
+        self._stop_event.set()
 
 # Initialize components
 config = Config()
@@ -355,20 +798,85 @@ app = App(token=config.SLACK_BOT_TOKEN, signing_secret=config.SLACK_SIGNING_SECR
 flask_app = Flask(__name__)
 handler = SlackRequestHandler(app)
 
-# Helper function to fetch Slack user name (with caching if desired)
+# Real names rarely change, so cache lookups to avoid a users.info call per event
+user_name_cache = TTLCache(maxsize=2048, ttl=600)
+
+# Helper function to fetch Slack user name
 def get_slack_user_name(user_id: str) -> str:
+    cached_name = user_name_cache.get(user_id)
+    if cached_name is not None:
+        return cached_name
     try:
         response = app.client.users_info(user=user_id)
-        return response["user"]["real_name"] if response.get("ok") else user_id
+        if not response.get("ok"):
+            return user_id
+        real_name = response["user"]["real_name"]
+        user_name_cache.set(user_id, real_name)
+        return real_name
     except Exception as e:
         logger.error(f"Error fetching user name for {user_id}: {e}")
         return user_id
 
+def invalidate_slack_user_name(user_id: str) -> None:
+    """Drop a cached user name so the next lookup hits Slack again"""
+    user_name_cache.invalidate(user_id)
+
+# Workspace URL from auth.test, used to build permalinks without calling chat.getPermalink
+workspace_url: Optional[str] = None
+# After a failed auth.test, wait this long before trying again so the fallback stays one call
+workspace_url_retry_interval = 600  # seconds
+workspace_url_retry_at = 0.0
+permalink_cache = TTLCache(maxsize=4096, ttl=3600)
+
+def get_workspace_url() -> Optional[str]:
+    global workspace_url, workspace_url_retry_at
+    if workspace_url is None and time.monotonic() >= workspace_url_retry_at:
+        try:
+            response = app.client.auth_test()
+            if response.get("ok") and response.get("url"):
+                workspace_url = response["url"].rstrip("/") + "/"
+            else:
+                logger.error(f"Could not resolve workspace URL: {response.get('error')}")
+        except Exception as e:
+            logger.error(f"Error resolving workspace URL: {e}")
+        if workspace_url is None:
+            workspace_url_retry_at = time.monotonic() + workspace_url_retry_interval
+    return workspace_url
+
+def get_thread_permalink(client: Any, channel: str, message_ts: str) -> str:
+    """Get a message permalink, building it locally when the workspace URL is known"""
+    base_url = get_workspace_url()
+    if base_url:
+        return f"{base_url}archives/{channel}/p{message_ts.replace('.', '')}"
+
+    cached_link = permalink_cache.get((channel, message_ts))
+    if cached_link is not None:
+        return cached_link
+    try:
+        permalink_response = client.chat_getPermalink(
+            channel=channel,
+            message_ts=message_ts
+        )
+        if not permalink_response.get("ok"):
+            return "Thread link unavailable"
+        permalink_cache.set((channel, message_ts), permalink_response["permalink"])
+        return permalink_response["permalink"]
+    except Exception as e:
+        logger.error(f"Error getting thread permalink: {e}")
+        return "Thread link unavailable"
+
 # Complete initialization of components
 guru_api = GuruAPI(config)
 sheets_logger = GoogleSheetsLogger(config)
 zendesk_monitor = ZendeskMonitor(config, app.client)
 
+# Background pool for slow handler work (Guru, Sheets, Slack posts) so Slack gets a prompt response
+task_executor = ThreadPoolExecutor(max_workers=8)
+
+# Message triggers, compiled once instead of normalizing the text per message
+_CS_LEADS_RE = re.compile(r"@\s*customer\s*support\s*leads", re.IGNORECASE)
+_HELP_RE = re.compile(r"@help", re.IGNORECASE)
+
 # Event Handlers
 @app.event("message")
 def handle_message(body: Dict[str, Any], event: Dict[str, Any], say: callable, client: Any) -> None:
@@ -378,112 +886,89 @@ def handle_message(body: Dict[str, Any], event: Dict[str, Any], say: callable, c
         user_id = event.get("user")
         channel = event.get("channel")
         thread_ts = event.get("thread_ts") or event.get("ts")
-        
-        real_name = get_slack_user_name(user_id)
 
         # Handle CS leads mention - route to CS leads channel
-        if "@customersupportleads" in text.replace(" ", ""):
-            logger.info(f"CS leads mention from {real_name}")
-            cleaned_message = text.replace("@customersupportleads", "").strip()
-            
-            # Get thread permalink
-            try:
-                permalink_response = client.chat_getPermalink(
-                    channel=channel,
-                    message_ts=thread_ts
-                )
-                thread_link = permalink_response["permalink"] if permalink_response.get("ok") else "Thread link unavailable"
-            except Exception as e:
-                logger.error(f"Error getting thread permalink: {e}")
-                thread_link = "Thread link unavailable"
-
-            # Send message to CS leads channel (set via env variable)
-            slack_message = (
-                f"🚨 *Customer Support Alert*\n"
-                f"👤 *User:* {real_name}\n"
-                f"💬 *Message:* {cleaned_message}\n"
-                f"🔗 *< {thread_link} | Go to Thread >*"
-            )
-
-            client.chat_postMessage(
-                channel=config.CS_LEADS_CHANNEL_ID,
-                text=slack_message
-            )
+        if _CS_LEADS_RE.search(text):
+            task_executor.submit(_process_cs_leads_mention, text, user_id, channel, thread_ts, client)
             return
 
         # Handle help requests
-        if text.lower().startswith("@help"):
-            query_text = text.replace("@help", "").strip()
+        help_match = _HELP_RE.match(text)
+        if help_match:
+            query_text = text[help_match.end():].strip()
             if not query_text:
                 return
+            task_executor.submit(_process_help_request, query_text, user_id, channel, thread_ts, say)
 
-            # Search Guru cards
-            cards = guru_api.search_cards(query_text)
-            answer_text = ""
-
-            if cards:
-                answer_text = "📚 *Here are some relevant Guru cards:*\n"
-                for card in cards[:5]:
-                    card_title = card.get("preferredPhrase", "Untitled Card")
-                    card_slug = card.get("slug", "")
-                    card_url = f"https://app.getguru.com/card/{card_slug}" if card_slug else "#"
-                    answer_text += f"🔹 *<{card_url}|{card_title}>*\n"
-            else:
-                answer_text = "🤖 Sorry, I couldn't find an answer. Please escalate if needed."
+    except Exception as e:
+        logger.error(f"Error handling message: {e}")
 
-            # Send response in the original thread
-            say(
-                thread_ts=thread_ts,
-                text=f"🤖 *Guru Answer:*\n{answer_text}"
-            )
+def _process_cs_leads_mention(text: str, user_id: str, channel: str, thread_ts: str, client: Any) -> None:
+    """Forward a CS leads mention to the CS leads channel."""
+    try:
+        real_name = get_slack_user_name(user_id)
+        logger.info(f"CS leads mention from {real_name}")
+        cleaned_message = _CS_LEADS_RE.sub("", text).strip()
+        
+        # Get thread permalink
+        thread_link = get_thread_permalink(client, channel, thread_ts)
 
-            # Add feedback buttons
-            feedback_message = "Was this answer helpful?"
-            say(
-                thread_ts=thread_ts,
-                text=feedback_message,
-                blocks=[
-                    {
-                        "type": "section",
-                        "text": {"type": "mrkdwn", "text": feedback_message}
-                    },
-                    {
-                        "type": "actions",
-                        "elements": [
-                            {
-                                "type": "button",
-                                "text": {"type": "plain_text", "text": "👍 Yes"},
-                                "style": "primary",
-                                "value": json.dumps({
-                                    "user": user_id,
-                                    "question": query_text,
-                                    "thread_ts": thread_ts,
-                                    "channel": channel
-                                }),
-                                "action_id": "feedback_yes"
-                            },
-                            {
-                                "type": "button",
-                                "text": {"type": "plain_text", "text": "👎 No"},
-                                "style": "danger",
-                                "value": json.dumps({
-                                    "user": user_id,
-                                    "question": query_text,
-                                    "thread_ts": thread_ts,
-                                    "channel": channel
-                                }),
-                                "action_id": "feedback_no"
-                            }
-                        ]
-                    }
-                ]
-            )
+        # Send message to CS leads channel (set via env variable)
+        slack_message = (
+            f"🚨 *Customer Support Alert*\n"
+            f"👤 *User:* {real_name}\n"
+            f"💬 *Message:* {cleaned_message}\n"
+            f"🔗 *< {thread_link} | Go to Thread >*"
+        )
+
+        client.chat_postMessage(
+            channel=config.CS_LEADS_CHANNEL_ID,
+            text=slack_message
+        )
+    except Exception as e:
+        logger.error(f"Error handling CS leads mention: {e}")
+
+def _process_help_request(query_text: str, user_id: str, channel: str, thread_ts: str, say: callable) -> None:
+    """Answer a help request from Guru, ask for feedback, and log it."""
+    try:
+        # Search Guru cards
+        cards = guru_api.search_cards(query_text)
+        answer_text = ""
+
+        if cards:
+            answer_text = "📚 *Here are some relevant Guru cards:*\n"
+            for card in cards[:5]:
+                card_title = card.get("preferredPhrase", "Untitled Card")
+                card_slug = card.get("slug", "")
+                card_url = f"https://app.getguru.com/card/{card_slug}" if card_slug else "#"
+                answer_text += f"🔹 *<{card_url}|{card_title}>*\n"
+        else:
+            answer_text = "🤖 Sorry, I couldn't find an answer. Please escalate if needed."
+
+        # Send response in the original thread
+        say(
+            thread_ts=thread_ts,
+            text=f"🤖 *Guru Answer:*\n{answer_text}"
+        )
+
+        # Add feedback buttons
+        feedback_value = orjson.dumps({
+            "user": user_id,
+            "question": query_text,
+            "thread_ts": thread_ts,
+            "channel": channel
+        }).decode()
+        say(
+            thread_ts=thread_ts,
+            text=FEEDBACK_MESSAGE,
+            blocks=render_blocks(_FEEDBACK_BLOCKS_TMPL, feedback_value=feedback_value)
+        )
 
-            # Log the interaction to Google Sheets
-            sheets_logger.log_entry(user_id, query_text, answer_text)
+        # Log the interaction to Google Sheets
+        sheets_logger.log_entry(user_id, query_text, answer_text)
 
     except Exception as e:
-        logger.error(f"Error handling message: {e}")
+        logger.error(f"Error handling help request: {e}")
 
 @app.action("acknowledge_alert")
 def handle_acknowledgment(ack, body, client):
@@ -504,13 +989,10 @@ def handle_acknowledgment(ack, body, client):
             channel=body["channel"]["id"],
             ts=body["message"]["ts"],
             text=f"⚠️ Alert: Agent {agent_name} has been in Transfers Only status for 10 minutes.",
-            blocks=[{
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*Agent Status Alert*\n⚠️ Agent *{agent_name}* has been in Transfers Only status for 10 minutes."
-                }
-            }]
+            blocks=render_blocks(
+                _SECTION_BLOCKS_TMPL,
+                text=f"*Agent Status Alert*\n⚠️ Agent *{agent_name}* has been in Transfers Only status for 10 minutes."
+            )
         )
     except Exception as e:
         logger.error(f"Error handling acknowledgment: {e}")
@@ -520,7 +1002,7 @@ def handle_feedback_yes(ack: callable, body: Dict[str, Any], client: Any) -> Non
     """Handle positive feedback."""
     try:
         ack()
-        user_data = json.loads(body["actions"][0]["value"])
+        user_data = orjson.loads(body["actions"][0]["value"])
         user_id = user_data["user"]
         question = user_data["question"]
         channel_id = body["channel"]["id"]
@@ -535,10 +1017,7 @@ def handle_feedback_yes(ack: callable, body: Dict[str, Any], client: Any) -> Non
             channel=channel_id,
             ts=message_ts,
             text=feedback_text,
-            blocks=[{
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": feedback_text}
-            }]
+            blocks=render_blocks(_SECTION_BLOCKS_TMPL, text=feedback_text)
         )
 
         logger.info(f"Positive feedback logged for {get_slack_user_name(user_id)}")
@@ -550,13 +1029,21 @@ def handle_feedback_no(ack: callable, body: Dict[str, Any], client: Any) -> None
     """Handle negative feedback."""
     try:
         ack()
-        user_data = json.loads(body["actions"][0]["value"])
+        user_data = orjson.loads(body["actions"][0]["value"])
         user_id = user_data["user"]
         question = user_data["question"]
         thread_ts = user_data["thread_ts"]
         channel = body["channel"]["id"]
         message_ts = body["message"]["ts"]
 
+        task_executor.submit(_escalate_request, user_id, question, thread_ts, channel, message_ts, client)
+    except Exception as e:
+        logger.error(f"Error handling negative feedback: {e}")
+
+def _escalate_request(user_id: str, question: str, thread_ts: str, channel: str,
+                      message_ts: str, client: Any) -> None:
+    """Record negative feedback and escalate the question to the help channel."""
+    try:
         # Update Google Sheets with negative feedback
         sheets_logger.update_feedback(user_id, question, "No", "Pending")
 
@@ -566,22 +1053,11 @@ def handle_feedback_no(ack: callable, body: Dict[str, Any], client: Any) -> None
             channel=channel,
             ts=message_ts,
             text=feedback_text,
-            blocks=[{
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": feedback_text}
-            }]
+            blocks=render_blocks(_SECTION_BLOCKS_TMPL, text=feedback_text)
         )
 
         # Get thread permalink
-        try:
-            permalink_response = client.chat_getPermalink(
-                channel=channel,
-                message_ts=thread_ts
-            )
-            thread_link = permalink_response["permalink"] if permalink_response.get("ok") else "Thread link unavailable"
-        except Exception as e:
-            logger.error(f"Error getting thread permalink: {e}")
-            thread_link = "Thread link unavailable"
+        thread_link = get_thread_permalink(client, channel, thread_ts)
 
         # Send escalation message to the help channel
         escalation_text = (
@@ -592,33 +1068,17 @@ def handle_feedback_no(ack: callable, body: Dict[str, Any], client: Any) -> None
             f"🔗 *< {thread_link} | Go to Thread >*"
         )
 
+        request_value = orjson.dumps({
+            "user": user_id,
+            "question": question,
+            "thread_ts": thread_ts,
+            "channel": channel,
+            "thread_link": thread_link
+        }).decode()
         client.chat_postMessage(
             channel=config.HELP_CHANNEL_ID,
             text=escalation_text,
-            blocks=[
-                {
-                    "type": "section",
-                    "text": {"type": "mrkdwn", "text": escalation_text}
-                },
-                {
-                    "type": "actions",
-                    "elements": [
-                        {
-                            "type": "button",
-                            "text": {"type": "plain_text", "text": "✅ Accept Request"},
-                            "style": "primary",
-                            "value": json.dumps({
-                                "user": user_id,
-                                "question": question,
-                                "thread_ts": thread_ts,
-                                "channel": channel,
-                                "thread_link": thread_link
-                            }),
-                            "action_id": "accept_request"
-                        }
-                    ]
-                }
-            ]
+            blocks=render_blocks(_ESCALATION_BLOCKS_TMPL, text=escalation_text, request_value=request_value)
         )
 
         # Notify the user in the thread that their request has been escalated
@@ -629,7 +1089,7 @@ def handle_feedback_no(ack: callable, body: Dict[str, Any], client: Any) -> None
         )
 
     except Exception as e:
-        logger.error(f"Error handling negative feedback: {e}")
+        logger.error(f"Error escalating request: {e}")
 
 @app.action("accept_request")
 def handle_accept_request(ack: callable, body: Dict[str, Any], client: Any) -> None:
@@ -637,7 +1097,7 @@ def handle_accept_request(ack: callable, body: Dict[str, Any], client: Any) -> N
     try:
         ack()
         manager_id = body["user"]["id"]
-        user_data = json.loads(body["actions"][0]["value"])
+        user_data = orjson.loads(body["actions"][0]["value"])
         user_id = user_data["user"]
         question = user_data["question"]
         thread_link = user_data.get("thread_link", "Thread link unavailable")
@@ -645,6 +1105,18 @@ def handle_accept_request(ack: callable, body: Dict[str, Any], client: Any) -> N
         thread_ts = user_data.get("thread_ts")
         message_ts = body["message"]["ts"]
 
+        task_executor.submit(
+            _process_request_acceptance, manager_id, user_id, question,
+            thread_link, original_channel, thread_ts, message_ts, client
+        )
+    except Exception as e:
+        logger.error(f"Error handling request acceptance: {e}")
+
+def _process_request_acceptance(manager_id: str, user_id: str, question: str, thread_link: str,
+                                original_channel: Optional[str], thread_ts: Optional[str],
+                                message_ts: str, client: Any) -> None:
+    """Record the accepting manager and notify the help channel, user, and thread."""
+    try:
         manager_name = get_slack_user_name(manager_id)
         user_name = get_slack_user_name(user_id)
 
@@ -664,10 +1136,7 @@ def handle_accept_request(ack: callable, body: Dict[str, Any], client: Any) -> N
             channel=config.HELP_CHANNEL_ID,
             ts=message_ts,
             text=update_text,
-            blocks=[{
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": update_text}
-            }]
+            blocks=render_blocks(_SECTION_BLOCKS_TMPL, text=update_text)
         )
 
         # DM the user to notify them that the request has been accepted
@@ -690,23 +1159,40 @@ def handle_accept_request(ack: callable, body: Dict[str, Any], client: Any) -> N
             )
 
     except Exception as e:
-        logger.error(f"Error handling request acceptance: {e}")
+        logger.error(f"Error processing request acceptance: {e}")
+
+# Slack redelivers events it considers timed out; remember recently handled event IDs
+seen_event_ids = TTLCache(maxsize=10_000, ttl=600)
 
 @flask_app.route("/slack/events", methods=["POST"])
 def slack_events() -> Any:
     """Handle Slack events webhook."""
-    return handler.handle(request)
+    payload = request.get_json(silent=True) or {}
+    event_id = payload.get("event_id")
+    # Claim the id before dispatching so concurrent redeliveries can't both be processed
+    if event_id and not seen_event_ids.claim(event_id):
+        logger.info(f"Ignoring redelivered event {event_id} (retry {request.headers.get('X-Slack-Retry-Num')})")
+        return "", 200
+
+    response = handler.handle(request)
+    # Release the claim for events that failed verification or were rejected
+    if event_id and response.status_code != 200:
+        seen_event_ids.invalidate(event_id)
+    return response
 
 def main() -> None:
     """Main application entry point."""
     try:
-        # Start Zendesk monitoring in the background
-        zendesk_monitor.start_monitoring()
-        
-        # Start Flask app
+        # Serve the Flask app under gunicorn; gunicorn.conf.py starts and stops Zendesk monitoring
+        app_dir = os.path.dirname(os.path.abspath(__file__))
         port = int(os.getenv("APP_PORT", 3000))
         logger.info(f"Starting application on port {port}")
-        flask_app.run(host="0.0.0.0", port=port)
+        os.execvp("gunicorn", [
+            "gunicorn",
+            "--chdir", app_dir,
+            "-c", os.path.join(app_dir, "gunicorn.conf.py"),
+            "SlackBot:flask_app"
+        ])
     except Exception as e:
         logger.error(f"Application startup failed: {e}")
         raise
@@ -0,0 +1,27 @@
+"""Gunicorn settings for SlackBot.
+
+Run with: gunicorn -c gunicorn.conf.py SlackBot:flask_app
+"""
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+bind = f"0.0.0.0:{os.getenv('APP_PORT', 3000)}"
+
+# Caches, the Sheets write queue and the Zendesk monitor live in process memory,
+# so scale with threads inside a single worker rather than with extra workers.
+workers = 1
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 8))
+
+def post_worker_init(worker):
+    """Start Zendesk monitoring once the app is loaded in the worker"""
+    from SlackBot import zendesk_monitor
+    zendesk_monitor.start_monitoring()
+
+def worker_exit(server, worker):
+    """Stop monitoring and write any queued Sheets rows before the worker exits"""
+    from SlackBot import zendesk_monitor, sheets_logger
+    zendesk_monitor.stop_monitoring()
+    sheets_logger.flush()